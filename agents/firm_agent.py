@@ -1,8 +1,9 @@
+import logging
 import mesa
 import numpy as np
-import pandas as pd
-import random
-from .intermediary_firm_agent import IntermediaryFirmAgent
+from .person_agent import SKILL_TYPES
+
+logger = logging.getLogger(__name__)
 
 
 class FirmAgent(mesa.Agent):
@@ -13,6 +14,57 @@ class FirmAgent(mesa.Agent):
     It responds to market conditions by adjusting production levels, prices, and employee count.
     The agent interacts with household agents (as consumers and workers) and the government agent.
     '''
+
+    # Configurations for hiring logic, shared by all firms
+
+    # Wage multiplier of each job level relative to the entry wage
+    wage_multipliers = {"entry": 1.0, "mid": 1.4, "senior": 2.0}
+
+    # Skill mix ratios for each firm area
+    skill_mix_config = {
+        "technical": {"senior": 0.25, "mid": 0.60, "entry": 0.15},  # Engineering, IT, technical roles need more senior expertise
+        "creative": {"senior": 0.25, "mid": 0.45, "entry": 0.30},   # Design/arts benefit from fresh perspectives but need experienced guidance
+        "physical": {"senior": 0.10, "mid": 0.35, "entry": 0.55},   # Manufacturing/construction has more entry-level positions
+        "social": {"senior": 0.20, "mid": 0.50, "entry": 0.30},     # Management/teaching needs experienced leaders
+        "analytical": {"senior": 0.25, "mid": 0.55, "entry": 0.20}, # Finance/data analysis requires more expertise
+        "service": {"senior": 0.10, "mid": 0.40, "entry": 0.50},    # Service industry has more entry-level positions
+    }
+
+    # Skill matching for each firm area
+    skill_type_matching_config = {
+        "technical": "technical",
+        "creative": "creative",
+        "physical": "physical", 
+        "social": "social",
+        "analytical": "analytical",
+        "service": "service",
+    }
+
+    # Minimum skill levels for each area and job level
+    min_skill_levels_config = {
+        "technical": {"senior": 80, "mid": 60, "entry": 40},
+        "creative": {"senior": 70, "mid": 50, "entry": 30}, 
+        "physical": {"senior": 60, "mid": 40, "entry": 10},
+        "social": {"senior": 70, "mid": 50, "entry": 30},
+        "analytical": {"senior": 80, "mid": 60, "entry": 30},
+        "service": {"senior": 60, "mid": 40, "entry": 20},
+    }
+
+    # Weights for demand averaging
+    # Must correspond to the firms' demand_history_length
+    demand_averaging_weights = (0.1, 0.15, 0.2, 0.25, 0.3)
+
+    # Per-firm attributes are kept in slots rather than in the instance dict
+    __slots__ = ("product", "firm_type", "firm_area", "production_capacity", "production_level",
+                 "production_cost", "produced_units", "capital", "markup", "price_one_step_ago",
+                 "price_two_steps_ago", "min_price", "revenue", "costs", "profit", "last_step_profit",
+                 "units_sold_this_step", "total_requested_this_step", "profit_history",
+                 "profit_history_length", "tax_paid_this_step", "inventory", "unmet_demand",
+                 "demand_history", "demand_history_length", "average_demand", "employees",
+                 "num_employees", "entry_wage", "revenue_per_employee", "last_step_revenue_per_emp",
+                 "product_price", "employee_adjustment_cooldown", "previous_employees", "total_labor",
+                 "labor_added_production_capacity", "demand_for_tracking", "inventory_demand_ratio",
+                 "sell_through_rate")
     
     def __init__(self, model, product, firm_type, firm_area, 
                  production_capacity, production_cost, markup,
@@ -69,51 +121,16 @@ class FirmAgent(mesa.Agent):
         self.demand_history = []
         self.demand_history_length = 5 
         self.average_demand = 0  # Track average demand
+        self.inventory_demand_ratio = 0.0  # Market indicators of the last price adjustment, for reporting
+        self.sell_through_rate = 0.0
         
         # Employee related parameters
         self.employees = []
         self.num_employees = 0
         self.entry_wage = entry_wage # REVERT to using original entry_wage
-        self.wage_multipliers = {"entry": 1.0, "mid": 1.4, "senior": 2.0}
         self.revenue_per_employee = 0
         self.last_step_revenue_per_emp = None        
 
-        # Configurations for hiring logic
-
-        # Skill mix ratios for each firm area
-        self.skill_mix_config = {
-            "technical": {"senior": 0.25, "mid": 0.60, "entry": 0.15},  # Engineering, IT, technical roles need more senior expertise
-            "creative": {"senior": 0.25, "mid": 0.45, "entry": 0.30},   # Design/arts benefit from fresh perspectives but need experienced guidance
-            "physical": {"senior": 0.10, "mid": 0.35, "entry": 0.55},   # Manufacturing/construction has more entry-level positions
-            "social": {"senior": 0.20, "mid": 0.50, "entry": 0.30},     # Management/teaching needs experienced leaders
-            "analytical": {"senior": 0.25, "mid": 0.55, "entry": 0.20}, # Finance/data analysis requires more expertise
-            "service": {"senior": 0.10, "mid": 0.40, "entry": 0.50},    # Service industry has more entry-level positions
-        }
-
-        # Skill matching for each firm area
-        self.skill_type_matching_config = {
-            "technical": "technical",
-            "creative": "creative",
-            "physical": "physical", 
-            "social": "social",
-            "analytical": "analytical",
-            "service": "service",
-        }
-
-        # Minimum skill levels for each area and job level
-        self.min_skill_levels_config = {
-            "technical": {"senior": 80, "mid": 60, "entry": 40},
-            "creative": {"senior": 70, "mid": 50, "entry": 30}, 
-            "physical": {"senior": 60, "mid": 40, "entry": 10},
-            "social": {"senior": 70, "mid": 50, "entry": 30},
-            "analytical": {"senior": 80, "mid": 60, "entry": 30},
-            "service": {"senior": 60, "mid": 40, "entry": 20},
-        }
-
-        # Weights for demand averaging
-        # Must correspond to self.demand_history_length
-        self.demand_averaging_weights = [0.1, 0.15, 0.2, 0.25, 0.3]
-
         # Populate initial workforce first to determine initial labor costs
         self._populate_initial_workforce(initial_employee_target)
 
@@ -144,7 +161,7 @@ class FirmAgent(mesa.Agent):
         self.employee_adjustment_cooldown = 0  # 0 means can adjust this step
 
         # Debug output
-        print(f"[DEBUG] Firm {self.unique_id} ({firm_type}/{firm_area}) initialized with price: {self.product_price:.2f}, initial_cost_per_unit: {initial_cost_per_unit:.2f}")
+        logger.debug("Firm %s (%s/%s) initialized with price: %.2f, initial_cost_per_unit: %.2f", self.unique_id, firm_type, firm_area, self.product_price, initial_cost_per_unit)
     
     def _populate_initial_workforce(self, target_count):
         '''
@@ -160,22 +177,22 @@ class FirmAgent(mesa.Agent):
         
         # print(f"[DEBUG] Firm {self.unique_id} ({self.firm_area}): Populating initial workforce. Target: {target_count}")
         if not hasattr(self.model, 'available_persons') or not self.model.available_persons:
-            print(f"[WARNING] Firm {self.unique_id}: No available persons in model to hire from for initial workforce.")
+            logger.warning("Firm %s: No available persons in model to hire from for initial workforce.", self.unique_id)
             return
 
         firm_skill_mix = self.skill_mix_config.get(self.firm_area)
         if not firm_skill_mix:
-            print(f"[WARNING] Firm {self.unique_id}: No skill mix config found for firm area {self.firm_area}.")
+            logger.warning("Firm %s: No skill mix config found for firm area %s.", self.unique_id, self.firm_area)
             return
 
         target_skill_type = self.skill_type_matching_config.get(self.firm_area)
         if not target_skill_type:
-            print(f"[WARNING] Firm {self.unique_id}: No skill type matching config for firm area {self.firm_area}.")
+            logger.warning("Firm %s: No skill type matching config for firm area %s.", self.unique_id, self.firm_area)
             return
 
         min_skill_levels_for_area = self.min_skill_levels_config.get(self.firm_area)
         if not min_skill_levels_for_area:
-            print(f"[WARNING] Firm {self.unique_id}: No min skill levels config for firm area {self.firm_area}.")
+            logger.warning("Firm %s: No min skill levels config for firm area %s.", self.unique_id, self.firm_area)
             return
             
         total_hired_count = 0
@@ -193,44 +210,40 @@ class FirmAgent(mesa.Agent):
             hired_for_level_count = 0
             min_skill_for_job_level = min_skill_levels_for_area.get(job_level)
             if min_skill_for_job_level is None:
-                print(f"[WARNING] Firm {self.unique_id}: No min skill level for job '{job_level}' in area {self.firm_area}.")
+                logger.warning("Firm %s: No min skill level for job '%s' in area %s.", self.unique_id, job_level, self.firm_area)
                 continue
 
-            # Find candidates with appropriate skills
-            possible_hires = []
-            for p_idx, p in enumerate(list(self.model.available_persons)): # Iterate over a copy for safe removal
-                if p.job_seeking is True and \
-                   p.employer is None and \
-                   p.skill_type == target_skill_type and \
-                   p.skill_level >= min_skill_for_job_level:
-                    possible_hires.append(p)
+            # Find candidates with appropriate skills among job seeking, unemployed persons
+            # of the target skill type, using the model's person arrays
+            candidate_rows = np.flatnonzero(
+                (self.model.person_skill_type_id == SKILL_TYPES.index(target_skill_type))
+                & self.model.person_job_seeking
+                & ~self.model.person_employed
+                & (self.model.person_skill_level >= min_skill_for_job_level)
+            )
+            possible_hires = [self.model.persons[row] for row in candidate_rows]
             
-            # Randomize candidate order for fair selection
-            random.shuffle(possible_hires)
+            # Randomly pick only as many candidates as this level still needs
+            num_to_pick = min(num_to_hire_for_level, target_count - total_hired_count, len(possible_hires))
 
             # Hire candidates until target for this level is reached
-            for candidate in possible_hires:
-                if hired_for_level_count >= num_to_hire_for_level or total_hired_count >= target_count:
-                    break
+            for candidate in self.random.sample(possible_hires, num_to_pick):
+                # Candidates were filtered for availability above; hiring sets their employer
+                candidate.employer = self
+                candidate.job_seeking = False
+                candidate.job_level = job_level
+                wage_multiplier_for_level = self.wage_multipliers.get(job_level, 1.0)
+                candidate.wage = self.entry_wage * wage_multiplier_for_level
                 
-                # Double check availability before hiring, in case another firm hired this person
-                # This can happen if not removing immediately from global list in this function
-                if candidate.employer is None and candidate.job_seeking is True:
-                    candidate.employer = self
-                    candidate.job_seeking = False
-                    candidate.job_level = job_level
-                    wage_multiplier_for_level = self.wage_multipliers.get(job_level, 1.0)
-                    candidate.wage = self.entry_wage * wage_multiplier_for_level
-                    
-                    self.employees.append(candidate)
-                    self.num_employees += 1
-                    total_hired_count += 1
-                    hired_for_level_count += 1
-                    
-                    # print(f"[DEBUG] Firm {self.unique_id}: Hired Person {candidate.unique_id} (Skill: {candidate.skill_level}) as '{job_level}'. Wage: {candidate.wage:.0f}")
+                self.employees.append(candidate)
+                self.num_employees += 1
+                total_hired_count += 1
+                hired_for_level_count += 1
+                
+                # print(f"[DEBUG] Firm {self.unique_id}: Hired Person {candidate.unique_id} (Skill: {candidate.skill_level}) as '{job_level}'. Wage: {candidate.wage:.0f}")
             # print(f"[DEBUG] Firm {self.unique_id}: Hired {hired_for_level_count} for job level '{job_level}'. Total firm employees: {self.num_employees}")
 
-        print(f"[INFO] Firm {self.unique_id} ({self.firm_area}): Initial workforce population complete. Target: {target_count}, Actual Hired: {self.num_employees}")
+        logger.info("Firm %s (%s): Initial workforce population complete. Target: %s, Actual Hired: %s", self.unique_id, self.firm_area, target_count, self.num_employees)
 
     def fulfill_demand_request(self, units_requested):
         '''
@@ -339,6 +352,8 @@ class FirmAgent(mesa.Agent):
         # Key market indicators
         inventory_demand_ratio = self.inventory / (self.total_requested_this_step + 1e-6)  # how much inventory compared to demand
         sell_through_rate = sold_units / (produced_units + 1e-6)  # what percentage of new products are sold
+        self.inventory_demand_ratio = inventory_demand_ratio
+        self.sell_through_rate = sell_through_rate
 
         # Calculate demand trend from history
         if len(self.demand_history) >= 2:
@@ -615,30 +630,34 @@ class FirmAgent(mesa.Agent):
             # print(f"[WARNING] Firm {self.unique_id}: model.available_persons not found. Cannot hire.")
             return False
 
-        # Find job seekers from all agents
-        available_job_seekers = [p for p in self.model.agents if hasattr(p, 'job_seeking') and p.job_seeking and p.employer is None]
+        # Find job seekers among the persons in the economy, using the model's person arrays
+        model = self.model
+        seeker_rows = np.flatnonzero(model.person_job_seeking & ~model.person_employed & model.person_in_model)
+        seeker_skill_levels = model.person_skill_level[seeker_rows]
 
         # Find candidates with matching skills
-        matching_candidates = [p for p in available_job_seekers
-                               if p.skill_level >= min_skill_level and
-                               p.skill_type == matching_skill_type and
-                               p.unique_id not in self.previous_employees]
+        matching_rows = seeker_rows[
+            (seeker_skill_levels >= min_skill_level)
+            & (model.person_skill_type_id[seeker_rows] == SKILL_TYPES.index(matching_skill_type))
+        ]
+        candidate_rows = [row for row in matching_rows
+                          if model.persons[row].unique_id not in self.previous_employees]
         
         # If no exact matches, relax skill requirements
-        candidates_to_consider = matching_candidates
-        if not matching_candidates:
-            candidates_to_consider = [p for p in available_job_seekers
-                                      if p.skill_level >= min_skill_level - 10 and # Relaxed skill level
-                                      p.unique_id not in self.previous_employees]
+        if not candidate_rows:
+            candidate_rows = [row for row in seeker_rows[seeker_skill_levels >= min_skill_level - 10] # Relaxed skill level
+                              if model.persons[row].unique_id not in self.previous_employees]
             
-        if not candidates_to_consider:
+        if not candidate_rows:
             # print(f"[DEBUG] Firm {self.unique_id}: No suitable candidates found to hire for {job_level} in {self.firm_area}.")
             return False
 
-        # Select from top half of candidates by skill level
-        candidates_to_consider.sort(key=lambda p: p.skill_level, reverse=True)
-        top_candidate_count = max(1, len(candidates_to_consider) // 2)
-        person_to_hire = random.choice(candidates_to_consider[:top_candidate_count])
+        # Select from top half of candidates by skill level (a stable sort, so equally
+        # skilled candidates keep their order)
+        candidate_rows = np.array(candidate_rows)
+        by_skill = np.argsort(-model.person_skill_level[candidate_rows], kind="stable")
+        top_candidate_count = max(1, len(candidate_rows) // 2)
+        person_to_hire = model.persons[self.random.choice(candidate_rows[by_skill[:top_candidate_count]])]
             
         # Calculate wage based on job level and skill bonus
         base_wage = self.entry_wage * self.wage_multipliers[job_level]
@@ -666,6 +685,21 @@ class FirmAgent(mesa.Agent):
         return True
 
 
+    def _employee_rows(self):
+        '''
+        Get the rows of the firm's employees in the model's person arrays.
+        
+        Employees that were removed from the simulation during setup (persons left
+        without a household) stay in self.employees but are not included, so wages
+        and labor are summed only over persons that are part of the economy.
+        
+        Returns:
+        - NumPy array of person rows
+        '''
+        rows = np.fromiter((emp.idx for emp in self.employees), dtype=np.intp, count=len(self.employees))
+        return rows[self.model.person_in_model[rows]]
+
+
     def calculate_total_wage_cost(self):
         '''
         Calculate the total wage costs for all employees.
@@ -677,12 +711,11 @@ class FirmAgent(mesa.Agent):
         - Total wage cost (float)
         '''
         # Get all employees
-        employees = [agent for agent in self.model.agents 
-                    if hasattr(agent, 'employer') and agent.employer == self]
+        employee_rows = self._employee_rows()
         
         # Sum all wages
-        if employees:
-            total_wages = sum(emp.wage for emp in employees)
+        if len(employee_rows):
+            total_wages = self.model.person_wage[employee_rows].sum()
             return total_wages
         else:
             # If no employees found, estimate based on entry wage and num_employees
@@ -700,12 +733,11 @@ class FirmAgent(mesa.Agent):
         Returns:
         - Total labor value (float)
         '''
-        employees = [agent for agent in self.model.agents 
-                    if hasattr(agent, 'employer') and agent.employer == self]
+        employee_rows = self._employee_rows()
         
         self.total_labor = 0
-        if employees:
-            self.total_labor = sum(emp.labor for emp in employees)
+        if len(employee_rows):
+            self.total_labor = self.model.person_labor[employee_rows].sum()
         return self.total_labor
 
     def step(self):
@@ -742,7 +774,7 @@ class FirmAgent(mesa.Agent):
         # print(f"[DEBUG] Firm {self.unique_id} costs: {production_costs}")
         
         # Send demand to intermediary firm 
-        intermediary_firm = [a for a in self.model.agents if isinstance(a, IntermediaryFirmAgent)][0]
+        intermediary_firm = self.model.intermediary_firm_agents[0]
         # Send demand to intermediary firm
         intermediary_firm.receive_firm_demand(production_costs)
 
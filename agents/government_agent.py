@@ -1,10 +1,6 @@
+from collections import deque
 import mesa
 import numpy as np
-import pandas as pd
-from .person_agent import PersonAgent
-from .household_agent import HouseholdAgent
-from .firm_agent import FirmAgent
-import random
 
 
 class GovernmentAgent(mesa.Agent):
@@ -69,7 +65,7 @@ class GovernmentAgent(mesa.Agent):
         necessity_price_changes = []
         luxury_price_changes = []
         
-        firm_agents = [agent for agent in self.model.agents if isinstance(agent, FirmAgent)]
+        firm_agents = self.model.firm_agents
 
         if not firm_agents:
             self.inflation_rate = 0.0
@@ -127,8 +123,8 @@ class GovernmentAgent(mesa.Agent):
         
         self.step_tax_revenue = 0
         
-        # Find all household agents
-        households = [agent for agent in self.model.agents if hasattr(agent, 'income_bracket')]
+        # Find all household agents that have an income bracket (set in their first step)
+        households = [agent for agent in self.model.household_agents if hasattr(agent, 'income_bracket')]
         
         for household in households:
             # Set the appropriate tax rate based on income bracket
@@ -162,7 +158,7 @@ class GovernmentAgent(mesa.Agent):
         '''
         
         self.step_corporate_tax_revenue = 0
-        firm_agents = [agent for agent in self.model.agents if isinstance(agent, FirmAgent)]
+        firm_agents = self.model.firm_agents
         for firm in firm_agents:
             self.step_corporate_tax_revenue += getattr(firm, 'tax_paid_this_step', 0)
         
@@ -183,7 +179,7 @@ class GovernmentAgent(mesa.Agent):
         '''
         
         total_unemployment_payments = 0
-        person_agents = [p for p in self.model.agents if isinstance(p, PersonAgent)]
+        person_agents = self.model.person_agents
         unemployed_persons = [p for p in person_agents if p.employer is None and p.job_seeking]
         
         payment_per_person = 10000 
@@ -208,7 +204,7 @@ class GovernmentAgent(mesa.Agent):
         '''
         
         total_low_income_transfers = 0
-        households = [h for h in self.model.agents if isinstance(h, HouseholdAgent)]
+        households = self.model.household_agents
         
         for household in households:
             total_necessity_target = household.necessity_spend_per_person * household.num_people
@@ -257,18 +253,18 @@ class GovernmentAgent(mesa.Agent):
             
             # Find firms that match this category and have inventory to sell
             potential_firms_for_category = [
-                f for f in self.model.agents 
-                if hasattr(f, 'firm_type') and f.firm_type == "necessity" 
-                and hasattr(f, 'firm_area') and f.firm_area == category_area
-                and hasattr(f, 'product_price') and f.product_price > 0
-                and hasattr(f, 'inventory') and f.inventory > 0
+                f for f in self.model.firms_by_area.get(category_area, ())
+                if f.firm_type == "necessity" and f.product_price > 0 and f.inventory > 0
             ]
-            random.shuffle(potential_firms_for_category)
+            self.random.shuffle(potential_firms_for_category)
+
+            # Firms are taken from the front in shuffled order
+            potential_firms_for_category = deque(potential_firms_for_category)
 
             # print(f"[GOV DEBUG] Attempting to spend ₺{remaining_budget_for_this_category:.2f} on {category_area}. Found {len(potential_firms_for_category)} firms.")
 
             while remaining_budget_for_this_category > 0.01 and potential_firms_for_category:
-                chosen_firm = potential_firms_for_category.pop(0) # Get and remove first firm
+                chosen_firm = potential_firms_for_category.popleft() # Get and remove first firm
 
                 if chosen_firm.product_price <= 0:
                     continue
@@ -305,10 +301,7 @@ class GovernmentAgent(mesa.Agent):
         - self.unemployment_rate with the percentage of unemployed in the labor force
         '''
         
-        person_agents = [
-            agent for agent in self.model.agents
-            if hasattr(agent, 'job_seeking') and hasattr(agent, 'employer')
-        ]
+        person_agents = self.model.person_agents
 
         # Labor force includes employed persons and job seekers
         current_labor_force = [
@@ -339,7 +332,7 @@ class GovernmentAgent(mesa.Agent):
         - GDP value for the current step
         '''
         
-        firms = [agent for agent in self.model.agents if hasattr(agent, 'produced_units')]
+        firms = self.model.firm_agents
         
         # Sum the value of all production (production * price)
         total_production_value = sum(firm.produced_units * firm.product_price for firm in firms)
@@ -355,21 +348,23 @@ class GovernmentAgent(mesa.Agent):
         
         The Gini coefficient ranges from 0 (perfect equality) to 1 (perfect inequality).
         This implementation uses person wages to compute the coefficient, providing
-        a measure of income distribution across the population.
+        a measure of income distribution across the population. The wages are read
+        from the model's person arrays and the sorted-population formula is evaluated
+        with NumPy.
         
         Returns:
         - Gini coefficient as a float between 0 and 1
         '''
-        persons = [agent for agent in self.model.agents if isinstance(agent, PersonAgent)]
-        incomes = [max(0, p.wage) for p in persons]  # Use max(0, wage) to avoid negative incomes
+        incomes = np.maximum(self.model.person_wage[self.model.person_rows], 0)  # Use max(0, wage) to avoid negative incomes
+        total_income = incomes.sum()
         
-        if not incomes or sum(incomes) == 0:
+        if not len(incomes) or total_income == 0:
             return 0.0
             
-        x = sorted(incomes)
+        x = np.sort(incomes)
         n = len(x)
-        B = sum(xi * (n - i) for i, xi in enumerate(x)) / (n * sum(x))
-        return 1 + (1 / n) - 2 * B
+        B = np.dot(x, np.arange(n, 0, -1)) / (n * total_income)
+        return float(1 + (1 / n) - 2 * B)
                     
     def step(self):
         '''
@@ -1,7 +1,4 @@
 import mesa
-import numpy as np
-import pandas as pd
-import random
 from .person_agent import PersonAgent
 
 
@@ -14,21 +11,37 @@ class HouseholdAgent(mesa.Agent):
     and preferences, spending on necessities first and luxuries if affordable.
     It interacts with firm agents to purchase goods and tracks financial metrics.
     '''
+
+    # Income tax rate until the government assigns one based on the income bracket
+    income_tax_rate = 0.15
+
+    # Target necessity spending per household member each step, shared by all households
+    necessity_spend_per_person = 57750
+
+    # Per-household attributes are kept in slots rather than in the instance dict.
+    # income_tax_rate is not a slot: it falls back to the class default until set
+    __slots__ = ("num_people", "household_step_income", "household_step_income_posttax",
+                 "household_step_expense", "household_step_savings", "wealth_bracket", "debt_level",
+                 "total_household_savings", "health_level", "welfare", "num_working_people",
+                 "num_not_seeking_job", "num_seeking_job", "members", "current_population",
+                 "income_bracket")
     
-    def __init__(self, model, num_people, income_tax_rate=0.15):
+    def __init__(self, model, num_people, income_tax_rate=None):
         '''
         Initialize a new household with financial parameters and member tracking.
         
         Parameters:
         - model: The model instance this household belongs to
         - num_people: Target number of people for this household
-        - income_tax_rate: Initial rate of income tax applied to household income
+        - income_tax_rate: Initial rate of income tax applied to household income,
+          if different from the shared default
         '''
         super().__init__(model)
 
         # Basic household attributes
         self.num_people = num_people # Target population for this household
-        self.income_tax_rate = income_tax_rate
+        if income_tax_rate is not None:
+            self.income_tax_rate = income_tax_rate
         
         # Financial metrics 
         self.household_step_income = 0
@@ -37,7 +50,6 @@ class HouseholdAgent(mesa.Agent):
         self.household_step_savings = 0
         self.wealth_bracket = None
         self.debt_level = 0
-        self.necessity_spend_per_person = 57750
         self.total_household_savings = self.necessity_spend_per_person * self.num_people
         
         # Welfare and employment tracking
@@ -92,10 +104,8 @@ class HouseholdAgent(mesa.Agent):
         if candidate_firms is None:
             # Find all firms of the specified category with price > 0 and inventory > 0
             firms_to_consider = [
-                a for a in self.model.agents
-                if hasattr(a, "firm_type") and a.firm_area == firm_category
-                and hasattr(a, "product_price") and a.product_price > 0
-                and hasattr(a, "inventory") and a.inventory > 0
+                a for a in self.model.firms_by_area.get(firm_category, ())
+                if a.product_price > 0 and a.inventory > 0
             ]
         else:
             # Filter the provided candidates to ensure they still meet criteria
@@ -117,7 +127,7 @@ class HouseholdAgent(mesa.Agent):
         cheapest_firms = firms_to_consider[:top_25_percent_count]
         
         # Choose one randomly from the cheapest firms
-        return random.choice(cheapest_firms) if cheapest_firms else None
+        return self.random.choice(cheapest_firms) if cheapest_firms else None
 
     def _calculate_cost_and_buy(self, firm_category, target_spend):
         '''
@@ -139,15 +149,14 @@ class HouseholdAgent(mesa.Agent):
         total_spent_for_category = 0.0
         remaining_spend_target = target_spend
 
-        # Get a list of all firms initially eligible (price > 0, inventory > 0)
+        # Get a list of all firms initially eligible (price > 0, inventory > 0),
+        # skipping sold-out firms and agents that are not firms of this category
         potential_purchase_candidates = [
-            a for a in self.model.agents
-            if hasattr(a, "firm_type") and a.firm_area == firm_category
-            and hasattr(a, "product_price") and a.product_price > 0
-            and hasattr(a, "inventory") and a.inventory > 0
+            a for a in self.model.firms_by_area.get(firm_category, ())
+            if a.product_price > 0 and a.inventory > 0
         ]
         
-        random.shuffle(potential_purchase_candidates) # Shuffle to vary order for random picks
+        self.random.shuffle(potential_purchase_candidates) # Shuffle to vary order for random picks
 
         # Attempt purchases while there's still budget and available firms
         while remaining_spend_target > 0.01 and potential_purchase_candidates:
@@ -160,7 +169,7 @@ class HouseholdAgent(mesa.Agent):
 
             # Firm selection based on wealth bracket
             if hasattr(self, 'wealth_bracket') and self.wealth_bracket in ["middle", "high"]:
-                chosen_firm = random.choice(currently_available_firms)
+                chosen_firm = self.random.choice(currently_available_firms)
             else: # Low wealth or wealth_bracket not set
                 # Pass the currently_available_firms to _get_cheapest_firm
                 # _get_cheapest_firm itself will sort them by price and pick from the cheapest 25%
@@ -209,7 +218,7 @@ class HouseholdAgent(mesa.Agent):
             return 0.0
             
         min_percent, max_percent = percentage_range
-        spend_percent = random.uniform(min_percent, max_percent)
+        spend_percent = self.random.uniform(min_percent, max_percent)
         total_luxury_budget_to_spend = remaining_budget * spend_percent
         
         # Define luxury categories
@@ -218,7 +227,7 @@ class HouseholdAgent(mesa.Agent):
             return 0.0 # Not enough types to choose from
 
         # Choose two luxury types to spend on
-        chosen_luxury_types = random.sample(luxury_types, 2)
+        chosen_luxury_types = self.random.sample(luxury_types, 2)
         
         if not chosen_luxury_types:
             return 0.0
@@ -233,12 +242,10 @@ class HouseholdAgent(mesa.Agent):
 
             # Find eligible firms for this luxury type
             potential_firms_for_type = [
-                firm for firm in self.model.agents 
-                if hasattr(firm, 'firm_area') and firm.firm_area == l_type
-                and hasattr(firm, 'product_price') and firm.product_price > 0
-                and hasattr(firm, 'inventory') and firm.inventory > 0
+                firm for firm in self.model.firms_by_area.get(l_type, ())
+                if firm.product_price > 0 and firm.inventory > 0
             ]
-            random.shuffle(potential_firms_for_type)
+            self.random.shuffle(potential_firms_for_type)
 
             # Attempt purchases while budget and firms remain
             while remaining_budget_for_this_type > 0.01 and potential_firms_for_type:
@@ -246,7 +253,7 @@ class HouseholdAgent(mesa.Agent):
                 if not currently_available_firms:
                     break
 
-                chosen_firm = random.choice(currently_available_firms)
+                chosen_firm = self.random.choice(currently_available_firms)
                 # chosen_firm is guaranteed to have product_price > 0 and inventory > 0 here
 
                 desired_units = 0
@@ -1,7 +1,9 @@
+import logging
 import mesa
 import numpy as np
-import pandas as pd
-import random
+from .person_agent import SKILL_TYPES
+
+logger = logging.getLogger(__name__)
 
 class IntermediaryFirmAgent(mesa.Agent):
     '''
@@ -30,6 +32,10 @@ class IntermediaryFirmAgent(mesa.Agent):
 
         self.skill_types_to_hire = ["physical", "service", "technical", "creative", "social", "analytical"]
 
+        # Rows of the employees in the model's person arrays, for paying wages in one go.
+        # Only the first num_employees entries are used; the buffer grows by doubling
+        self.employee_indices = np.empty(max(1, initial_employee_target), dtype=np.int32)
+
         self._populate_initial_workforce(initial_employee_target)
 
     def _populate_initial_workforce(self, target_total_employees):
@@ -45,52 +51,49 @@ class IntermediaryFirmAgent(mesa.Agent):
         '''
         
         if not hasattr(self.model, 'available_persons') or not self.model.available_persons:
-            print(f"[WARNING] IntermediaryFirm {self.unique_id}: No available persons for initial workforce.")
+            logger.warning("IntermediaryFirm %s: No available persons for initial workforce.", self.unique_id)
             return
 
         if not self.skill_types_to_hire:
-            print(f"[WARNING] IntermediaryFirm {self.unique_id}: No skill types defined for hiring.")
+            logger.warning("IntermediaryFirm %s: No skill types defined for hiring.", self.unique_id)
             return
 
         num_skill_categories = len(self.skill_types_to_hire)
-        if num_skill_categories == 0: return
 
-        # Calculate target hires per skill type to achieve balanced workforce
-        num_to_hire_per_skill_type = round(target_total_employees / num_skill_categories)
-        
-        total_hired_count = 0
+        # Split the target across skill types to achieve balanced workforce, with the
+        # per-type targets adding up exactly to the total target
+        per_skill_type_targets = np.diff(
+            np.linspace(0, target_total_employees, num_skill_categories + 1).astype(int)
+        ).tolist()
 
         # Hire workers for each skill type
-        for skill_type in self.skill_types_to_hire:
-            if total_hired_count >= target_total_employees:
-                break
-            
-            hired_for_this_skill_type = 0
-            
-            # Find candidates with matching skill type
-            possible_hires = []
-            for p in list(self.model.available_persons):
-                if p.job_seeking is True and p.employer is None and p.skill_type == skill_type:
-                    possible_hires.append(p)
-            random.shuffle(possible_hires)
+        for skill_type, num_to_hire_for_skill_type in zip(self.skill_types_to_hire, per_skill_type_targets):
+            # Find candidates among job seeking, unemployed persons with matching skill type,
+            # using the model's person arrays
+            candidate_rows = np.flatnonzero(
+                (self.model.person_skill_type_id == SKILL_TYPES.index(skill_type))
+                & self.model.person_job_seeking
+                & ~self.model.person_employed
+            )
+            possible_hires = [self.model.persons[row] for row in candidate_rows]
+
+            # Randomly pick only as many candidates as this skill type needs
+            num_to_pick = min(num_to_hire_for_skill_type, len(possible_hires))
 
             # Hire candidates until target for this skill type is reached
-            for candidate_idx, candidate in enumerate(possible_hires):
-                if hired_for_this_skill_type >= num_to_hire_per_skill_type or total_hired_count >= target_total_employees:
-                    break
-
-                if candidate.employer is None and candidate.job_seeking is True:
-                    candidate.employer = self
-                    candidate.job_seeking = False
-                    candidate.job_level = "entry"
-                    candidate.wage = 0 
-                    
-                    self.employees.append(candidate)
-                    self.num_employees += 1
-                    total_hired_count += 1
-                    hired_for_this_skill_type +=1
+            for candidate in self.random.sample(possible_hires, num_to_pick):
+                candidate.employer = self
+                candidate.job_seeking = False
+                candidate.job_level = "entry"
+                candidate.wage = 0 
+                
+                if self.num_employees == len(self.employee_indices):
+                    self.employee_indices = np.resize(self.employee_indices, 2 * len(self.employee_indices))
+                self.employee_indices[self.num_employees] = candidate.idx
+                self.employees.append(candidate)
+                self.num_employees += 1
             
-        print(f"[INFO] IntermediaryFirm {self.unique_id}: Initial workforce. Target: {target_total_employees}, Actual Hired: {self.num_employees}")
+        logger.info("IntermediaryFirm %s: Initial workforce. Target: %s, Actual Hired: %s", self.unique_id, target_total_employees, self.num_employees)
 
     def receive_firm_demand(self, cost):
         '''
@@ -130,8 +133,7 @@ class IntermediaryFirmAgent(mesa.Agent):
             wage_per_employee = 0
 
         # Distribute revenue equally among all employees as wages
-        for person_idx, person in enumerate(self.employees):
-            person.wage = wage_per_employee
+        self.model.person_wage[self.employee_indices[:self.num_employees]] = wage_per_employee
             
         # Reset demand tracker for the next step
         self.demand_received_from_firms = 0
@@ -1,7 +1,9 @@
 import mesa
 import numpy as np
-import pandas as pd
-import random
+
+
+# Skill types a person can have; a person's skill_type_id is its index in this tuple
+SKILL_TYPES = ("physical", "service", "technical", "creative", "social", "analytical")
 
 
 class PersonAgent(mesa.Agent):
@@ -13,44 +15,166 @@ class PersonAgent(mesa.Agent):
     wages earned from employment. They have different skill types and levels
     that determine their suitability for various jobs.
     '''
-    def __init__(self, model, job_seeking=True, wage=0, work_hours=40):
+
+    # Skill improvement rate per step (0.1%), shared by all persons
+    skill_improvement_rate = 0.001
+
+    # Per-person attributes are kept in slots rather than in the instance dict.
+    # Skill and employment state live in the model's person arrays (see the properties)
+    __slots__ = ("idx", "household", "_employer", "skill_type", "work_hours",
+                 "job_level", "unemployed_counter", "study_cooldown")
+
+    # Attributes stored in the model's person arrays at row idx, by model array name
+    state_arrays = {
+        "skill_level": "person_skill_level",
+        "skill_type_id": "person_skill_type_id",
+        "labor": "person_labor",
+        "wage": "person_wage",
+        "job_seeking": "person_job_seeking",
+        "studying_for_min_skills": "person_studying",
+        "is_employed": "person_is_employed",
+    }
+
+    # Attributes stored as integer codes in the model's person arrays at row idx,
+    # by model array name and the labels of the codes
+    state_codes = {
+        "skill_type": ("person_skill_type_id", SKILL_TYPES),
+    }
+
+    def __init__(self, model, idx, job_seeking=True, wage=0, work_hours=40):
         '''
         Initialize a person agent with employment characteristics and skills.
         
         Parameters:
         - model: The main simulation model
+        - idx: Row of this person in the model's person state arrays, where the
+          model has already drawn the skill type, skill level and labor
         - job_seeking: Whether the person is actively looking for work
         - wage: Current wage/salary of the person
         - work_hours: Preferred hours worked per week
         '''
         super().__init__(model)
 
+        # Skill and employment state live in the model's person arrays at this row
+        self.idx = idx
+
         self.household = None # Will be set by HouseholdAgent
         self.employer = None
         
-        skill_types = ["physical", "service", "technical", "creative", "social", "analytical"]
-        self.skill_type = random.choice(skill_types)
+        self.skill_type = SKILL_TYPES[self.skill_type_id]
         
         self.job_seeking = job_seeking
         self.wage = wage
         self.work_hours = work_hours
         
-        # Generate a more realistic skill distribution (normal distribution centered around 40-60)
-        self.skill_level = min(100, max(1, random.normalvariate(50, 15)))  # Normal distribution with mean 50, std 15
-        self.labor = self.skill_level/random.uniform(3, 5)
-        
         # Job level (senior, mid, entry) - will be set when hired
         self.job_level = None
         
         self.unemployed_counter = 0  # Track how many steps person has been unemployed
         self.study_cooldown = 0  # Track remaining study period when person stops looking
         
-        # Initial skill improvement rate (0.2% per step)
-        self.skill_improvement_rate = 0.001
-        
         # Flag to track if the person is currently studying due to low skills
         self.studying_for_min_skills = False
-        
+
+    @property
+    def skill_level(self):
+        return self.model.person_skill_level[self.idx]
+
+    @skill_level.setter
+    def skill_level(self, value):
+        self.model.person_skill_level[self.idx] = value
+
+    @property
+    def skill_type_id(self):
+        return self.model.person_skill_type_id[self.idx]
+
+    @skill_type_id.setter
+    def skill_type_id(self, value):
+        self.model.person_skill_type_id[self.idx] = value
+
+    @property
+    def labor(self):
+        return self.model.person_labor[self.idx]
+
+    @labor.setter
+    def labor(self, value):
+        self.model.person_labor[self.idx] = value
+
+    @property
+    def wage(self):
+        return self.model.person_wage[self.idx]
+
+    @wage.setter
+    def wage(self, value):
+        self.model.person_wage[self.idx] = value
+
+    @property
+    def job_seeking(self):
+        return bool(self.model.person_job_seeking[self.idx])
+
+    @job_seeking.setter
+    def job_seeking(self, value):
+        self.model.person_job_seeking[self.idx] = value
+
+    @property
+    def studying_for_min_skills(self):
+        return bool(self.model.person_studying[self.idx])
+
+    @studying_for_min_skills.setter
+    def studying_for_min_skills(self, value):
+        self.model.person_studying[self.idx] = value
+
+    @property
+    def is_employed(self):
+        # 1 if the person has an employer, 0 if not
+        return int(self.model.person_is_employed[self.idx])
+
+    @property
+    def employer(self):
+        return self._employer
+
+    @employer.setter
+    def employer(self, value):
+        # Mirror employment status into the model's array for the vectorized step
+        self._employer = value
+        self.model.person_employed[self.idx] = value is not None
+
+    @staticmethod
+    def step_persons(model, rows):
+        '''
+        Execute one step for many persons at once using the model's person arrays.
+
+        Applies the same study and job-seeking rules as a single person's step to
+        every given row with array operations instead of a loop over agents.
+
+        Parameters:
+        - model: The main simulation model holding the person arrays
+        - rows: Indices of the persons to step
+        '''
+        skill_level = model.person_skill_level[rows]
+        job_seeking = model.person_job_seeking[rows]
+        employed = model.person_employed[rows]
+        min_entry_level = model.min_entry_table[model.person_skill_type_id[rows]]
+
+        # Persons already studying, or job seeking but below the entry level, study this step
+        studying = model.person_studying[rows] | (job_seeking & (skill_level < min_entry_level))
+
+        # Study more intensively to reach minimum requirements
+        skill_level[studying] = np.minimum(100, skill_level[studying] * (1 + PersonAgent.skill_improvement_rate * 1.5))
+
+        # Persons who reached the minimum skill level go back to job seeking
+        reached = studying & (skill_level >= min_entry_level)
+        job_seeking[studying] = reached[studying]
+        studying &= ~reached
+
+        # If employed, should not be job seeking
+        job_seeking &= ~employed
+        studying &= ~employed
+
+        model.person_skill_level[rows] = skill_level
+        model.person_job_seeking[rows] = job_seeking
+        model.person_studying[rows] = studying
+
     def step(self):
         '''
         Execute one step of the person agent's life cycle.
@@ -61,67 +185,8 @@ class PersonAgent(mesa.Agent):
         - Increasing skill levels through study
         - Managing job-seeking status based on employment and study status
         
-        The step method is called by the model scheduler at each simulation step.
-        '''
-        '''
-        # Improve skills if employed
-        if self.employer is not None:
-            self.skill_level = min(100, self.skill_level * (1 + self.skill_improvement_rate))
-            
-        # Handle unemployment and skill improvement through study
-        elif self.job_seeking:
-            self.unemployed_counter += 1
-
-            # If unemployed for too long, take a break to study
-            if self.unemployed_counter >= 4:  #  threshold before giving up
-                self.job_seeking = False
-                self.study_cooldown = 2  # Study for 2 steps
-                self.unemployed_counter = 0
-                
-        # If in study period, improve skills and track cooldown        
-        elif self.study_cooldown > 0:
-            self.skill_level = min(100, self.skill_level * (1 + self.skill_improvement_rate * 1.5))
-            self.study_cooldown -= 1
-            
-            # Resume job seeking after study period
-            if self.study_cooldown == 0:
-                self.job_seeking = True
-                
-            # If employed, should not be job seeking
-            if self.employer is not None:
-                self.job_seeking = False
+        The model steps all persons together through step_persons; this method
+        applies the same update to a single person.
         '''
 
-        # Check if skill level is below entry level for their skill type
-        min_entry_level = 10  # Default fallback value
-        
-        # Find any firm to get the configuration
-        for agent in self.model.agents:
-            if hasattr(agent, 'min_skill_levels_config'):
-                # Get the minimum entry level skill for this person's skill type
-                if self.skill_type in agent.min_skill_levels_config:
-                    min_entry_level = agent.min_skill_levels_config[self.skill_type]["entry"]
-                break
-        
-        # If currently studying for minimum skills or job seeking but below threshold
-        if self.studying_for_min_skills or (self.job_seeking and self.skill_level < min_entry_level):
-            self.studying_for_min_skills = True
-            self.job_seeking = False
-            
-            # Study more intensively to reach minimum requirements
-            self.skill_level = min(100, self.skill_level * (1 + self.skill_improvement_rate * 1.5))
-            
-            # Check if reached minimum skill level
-            if self.skill_level >= min_entry_level:
-                self.studying_for_min_skills = False
-                self.job_seeking = True
-        
-        # If employed, should not be job seeking
-        if self.employer is not None:
-            self.job_seeking = False
-            self.studying_for_min_skills = False
-
-
-
-        
-
+        PersonAgent.step_persons(self.model, [self.idx])
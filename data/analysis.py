@@ -1,13 +1,63 @@
+import functools
 import pandas as pd
-import matplotlib.pyplot as plt
 import os
-import seaborn as sns
 from typing import List, Union, Optional, Dict, Any
-import numpy as np
 
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 
+@functools.cache
+def _pyplot():
+    """
+    Import matplotlib's pyplot on first use, so importing this module for a
+    simulation run does not pay for it until plots are actually made.
+    """
+    import matplotlib
+    matplotlib.use("Agg")  # Plots are only saved to files, so use the non-interactive backend
+    import matplotlib.pyplot as plt
+    return plt
+
+@functools.cache
+def _seaborn():
+    """
+    Import seaborn on first use; only box, violin and heatmap plots need it.
+    """
+    import seaborn as sns
+    return sns
+
+# Figure and axes shared by all plots, so each plot does not create a new figure
+_figure = None
+_axes = None
+
+def _get_axes(figsize: tuple):
+    """
+    Return the shared figure and a fresh axes, resized for the next plot.
+
+    Parameters:
+    -----------
+    figsize : tuple
+        Figure size (width, height)
+    """
+    global _figure, _axes
+    if _figure is None:
+        _figure, _axes = _pyplot().subplots(figsize=figsize)
+    else:
+        # Clearing the whole figure also drops extra axes such as heatmap colorbars
+        _figure.clear()
+        _figure.set_size_inches(figsize)
+        _axes = _figure.add_subplot()
+    return _figure, _axes
+
+def close_plots() -> None:
+    """
+    Release the shared figure and any other open figures once plotting is done.
+    """
+    global _figure, _axes
+    if _figure is not None:
+        _pyplot().close("all")
+    _figure = None
+    _axes = None
+
 def create_plot(
     df: pd.DataFrame,
     plot_type: str = "line",
@@ -80,81 +130,87 @@ def create_plot(
     
     os.makedirs(results_folder, exist_ok=True)
 
-    # Create figure
-    plt.figure(figsize=figsize)
+    # Reuse the shared figure
+    fig, ax = _get_axes(figsize)
 
     # Plot based on type
     if plot_type == "line":
         if columns is None:
             raise ValueError("columns parameter is required for line plots")
         
-        for i, col in enumerate(columns):
-            if col in df.columns:
-                color = colors[i] if colors and i < len(colors) else None
-                plt.plot(df.index, df[col], label=col, color=color, **kwargs)
-            else:
+        df_columns = set(df.columns)
+        for col in columns:
+            if col not in df_columns:
                 print(f"⚠ Column '{col}' not found in DataFrame. Skipping.")
 
+        # Plot all available columns with a single call, one line per column
+        plot_columns = [(i, col) for i, col in enumerate(columns) if col in df_columns]
+        if plot_columns:
+            lines = ax.plot(df.index, df[[col for _, col in plot_columns]].to_numpy(), **kwargs)
+            for line, (i, col) in zip(lines, plot_columns):
+                line.set_label(col)
+                if colors and i < len(colors):
+                    line.set_color(colors[i])
+
         if "xticks" not in kwargs:
             max_step = df.index.max() + 10
-            plt.xticks(range(0, max_step + 1, 10))
+            ax.set_xticks(range(0, max_step + 1, 10))
 
     elif plot_type == "bar":
         if groupby_col is None or value_col is None:
             raise ValueError("groupby_col and value_col parameters are required for bar plots")
         
         grouped = df.groupby(groupby_col)[value_col].agg(agg_func)
-        bars = plt.bar(grouped.index, grouped.values, color=colors[0] if colors else "#69b3a2", **kwargs)
+        bars = ax.bar(grouped.index, grouped.values, color=colors[0] if colors else "#69b3a2", **kwargs)
         
         if show_values:
             for bar in bars:
                 yval = bar.get_height()
-                plt.text(bar.get_x() + bar.get_width() / 2, yval, f"{yval:.2f}", 
+                ax.text(bar.get_x() + bar.get_width() / 2, yval, f"{yval:.2f}", 
                         ha="center", va="bottom")
 
     elif plot_type == "scatter":
         if columns is None or len(columns) != 2:
             raise ValueError("columns parameter must contain exactly 2 columns for scatter plots")
         
-        plt.scatter(df[columns[0]], df[columns[1]], 
+        ax.scatter(df[columns[0]], df[columns[1]], 
                    color=colors[0] if colors else None, **kwargs)
 
     elif plot_type == "box":
         if groupby_col is None or value_col is None:
             raise ValueError("groupby_col and value_col parameters are required for box plots")
         
-        sns.boxplot(data=df, x=groupby_col, y=value_col, **kwargs)
+        _seaborn().boxplot(data=df, x=groupby_col, y=value_col, ax=ax, **kwargs)
 
     elif plot_type == "violin":
         if groupby_col is None or value_col is None:
             raise ValueError("groupby_col and value_col parameters are required for violin plots")
         
-        sns.violinplot(data=df, x=groupby_col, y=value_col, **kwargs)
+        _seaborn().violinplot(data=df, x=groupby_col, y=value_col, ax=ax, **kwargs)
 
     elif plot_type == "heatmap":
         if columns is None:
             raise ValueError("columns parameter is required for heatmap plots")
         
         correlation_matrix = df[columns].corr()
-        sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', **kwargs)
+        _seaborn().heatmap(correlation_matrix, annot=True, cmap='coolwarm', ax=ax, **kwargs)
 
     # Customize plot
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel or "Value")
-    plt.title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel or "Value")
+    ax.set_title(title)
     
     if grid:
-        plt.grid(True)
+        ax.grid(True)
     
     if legend and plot_type in ["line", "scatter"]:
-        plt.legend()
+        ax.legend()
     
-    plt.xticks(rotation=rotation)
+    ax.tick_params(axis="x", labelrotation=rotation)
 
     # Save plot
     file_path = os.path.join(results_folder, filename)
-    plt.savefig(file_path, bbox_inches='tight')
-    plt.close()
+    fig.savefig(file_path, bbox_inches='tight')
     print(f"Plot saved to {file_path}")
 
 def create_time_series_plot(
@@ -384,14 +440,14 @@ def create_time_series_by_type(
         print("Warning: No results folder provided. Please provide results_folder from run.py")
         return
 
-    # Transform data for time series
-    df_reset = df.reset_index()
-    type_data = df_reset[df_reset[type_col].notnull()]
-    values_by_type = type_data.pivot_table(
-        values=value_col,
-        index="Step",
-        columns=type_col,
-        aggfunc=aggfunc
+    # Transform data for time series, flattening the index only for rows that have a type
+    type_data = df[df[type_col].notnull()].reset_index()
+    type_data[type_col] = type_data[type_col].astype("category")
+    values_by_type = (
+        type_data.groupby(["Step", type_col], observed=True)[value_col]
+        .agg(aggfunc)
+        .unstack(type_col)
+        .dropna(axis=1, how="all")
     )
 
     # Determine ylabel if not provided, considering aggfunc
@@ -0,0 +1,431 @@
+import operator
+import mesa
+import numpy as np
+import pandas as pd
+
+
+class EconomyDataCollector(mesa.DataCollector):
+    '''
+    Data collector that records agent data separately for each agent class.
+
+    Mesa's DataCollector calls every agent reporter on every agent, so each
+    agent also pays for the fields of all other agent classes, which are None
+    for it. Here each agent class reports only its own fields, gathered column
+    by column in one pass over the agents of that class, and the per-class
+    tables are combined into the usual Step/AgentID indexed DataFrame on request.
+    Model reporters are handled by mesa.DataCollector, except that several model
+    columns can also be filled by one reporter returning a tuple of values.
+    '''
+
+    def __init__(self, model_reporters=None, agent_reporters=None):
+        '''
+        Initialize the data collector with model and per-class agent reporters.
+
+        Parameters:
+        - model_reporters: Dictionary of model reporter names and attributes/functions,
+          as accepted by mesa.DataCollector. A key can also be a tuple of names, with a
+          function of the model returning one scalar value per name
+        - agent_reporters: Dictionary mapping each agent class to a dictionary of
+          reporter names and either attribute names or functions of the agent
+        '''
+        model_reporters = model_reporters or {}
+
+        # Reporters that fill several model columns at once, as (names, function) pairs
+        self._model_group_reporters = [
+            (names, reporter) for names, reporter in model_reporters.items() if isinstance(names, tuple)
+        ]
+
+        super().__init__(model_reporters={
+            name: reporter for name, reporter in model_reporters.items() if not isinstance(name, tuple)
+        })
+
+        for names, _ in self._model_group_reporters:
+            for name in names:
+                self.model_vars[name] = []
+
+        self.agent_class_reporters = agent_reporters or {}
+
+        # Column order of the combined agent DataFrame, in order of first appearance
+        self.agent_columns = list(dict.fromkeys(
+            name for reporters in self.agent_class_reporters.values() for name in reporters
+        ))
+
+        # Attributes that an agent class keeps in model arrays (its state_arrays, mapping
+        # attribute name to model array name) are read for all its agents with one index
+        # into the array: {agent_class: [(name, model array name)]}
+        self._agent_array_columns = {}
+
+        # Attributes that an agent class keeps as integer codes in model arrays (its
+        # state_codes, mapping attribute name to model array name and the labels of the
+        # codes) are read the same way, as codes: {agent_class: [(name, model array name)]}
+        self._agent_code_columns = {}
+
+        # Labels of the codes read from model arrays: {agent_class: {name: labels}}
+        self._agent_code_labels = {}
+
+        # Getter of every other reporter per agent class: attrgetter for attribute names,
+        # so each value is read in C, or the reporter function itself
+        self._agent_getters = {}
+
+        for agent_class, reporters in self.agent_class_reporters.items():
+            state_arrays = getattr(agent_class, "state_arrays", {})
+            state_codes = getattr(agent_class, "state_codes", {})
+            self._agent_array_columns[agent_class] = [
+                (name, state_arrays[reporter]) for name, reporter in reporters.items()
+                if not callable(reporter) and reporter in state_arrays
+            ]
+            self._agent_code_columns[agent_class] = [
+                (name, state_codes[reporter][0]) for name, reporter in reporters.items()
+                if not callable(reporter) and reporter in state_codes
+            ]
+            self._agent_code_labels[agent_class] = {
+                name: state_codes[reporter][1] for name, reporter in reporters.items()
+                if not callable(reporter) and reporter in state_codes
+            }
+            self._agent_getters[agent_class] = [
+                (name, reporter if callable(reporter) else operator.attrgetter(reporter), reporter)
+                for name, reporter in reporters.items()
+                if callable(reporter) or (reporter not in state_arrays and reporter not in state_codes)
+            ]
+
+        # Collected rows per agent class, see _new_agent_buffer
+        self._agent_buffers = {
+            agent_class: self._new_agent_buffer(agent_class) for agent_class in self.agent_class_reporters
+        }
+
+    def _new_agent_buffer(self, agent_class):
+        '''
+        Create an empty buffer for the collected rows of an agent class.
+
+        The rows are stored as one NumPy array per column that grows by doubling.
+        Columns of strings (or other labels) are stored as integer codes, with the
+        labels of the codes in "categories", in order of their codes. Columns that
+        have only held None so far are listed in "pending" until their type is known.
+
+        Parameters:
+        - agent_class: Agent class the buffer is for
+
+        Returns:
+        - Dictionary {"rows": number of rows, "columns": {name: array},
+          "categories": {name: {label: code}}, "pending": set of names}
+        '''
+        return {
+            "rows": 0,
+            "columns": {},
+            "categories": {
+                name: {label: code for code, label in enumerate(labels)}
+                for name, labels in self._agent_code_labels[agent_class].items()
+            },
+            "pending": set(),
+        }
+
+    def collect(self, model, agents=True):
+        '''
+        Collect model data and the data of every agent class for the current step.
+
+        Parameters:
+        - model: The model instance to collect data from
+        - agents: Whether to collect agent data this step as well; model data is
+          cheap and is always collected
+        '''
+        super().collect(model)
+
+        for names, reporter in self._model_group_reporters:
+            for name, value in zip(names, reporter(model)):
+                self.model_vars[name].append(value)
+
+        if not agents:
+            return
+
+        # The model keeps its agents bucketed by exact type, in creation order
+        agents_by_type = model.agents_by_type
+
+        for agent_class, getters in self._agent_getters.items():
+            agents = list(agents_by_type.get(agent_class, ()))
+            if not agents:
+                continue
+
+            values = {
+                "Step": [model.steps] * len(agents),
+                "AgentID": [agent.unique_id for agent in agents],
+            }
+
+            # Columns read as codes from model arrays
+            codes = {}
+
+            array_columns = self._agent_array_columns[agent_class]
+            code_columns = self._agent_code_columns[agent_class]
+            if array_columns or code_columns:
+                rows = np.fromiter((agent.idx for agent in agents), dtype=np.intp, count=len(agents))
+                for name, array_name in array_columns:
+                    values[name] = getattr(model, array_name)[rows]
+                for name, array_name in code_columns:
+                    codes[name] = getattr(model, array_name)[rows]
+
+            for name, getter, reporter in getters:
+                try:
+                    values[name] = list(map(getter, agents))
+                except AttributeError:
+                    # Some agents do not have the attribute (yet), report None for them
+                    values[name] = [getattr(agent, reporter, None) for agent in agents]
+
+            self._append_rows(self._agent_buffers[agent_class], values, len(agents), codes)
+
+    @staticmethod
+    def _append_rows(buffer, values, num_rows, codes=None):
+        '''
+        Append rows to the column arrays of an agent class.
+
+        Integer columns are stored as int32 arrays (int64 if a value needs it) and other
+        numeric columns as float64 arrays, with None (a value an agent does not have yet)
+        stored as NaN. Boolean columns are stored as bool arrays. Columns holding strings
+        are stored as int32 codes of their values (None included), with the values listed
+        in the buffer's categories. A column that has only received None so far is kept
+        as an object array until a value shows whether it holds numbers or strings, e.g.
+        a bracket that is not assigned yet. Arrays double in size when full.
+
+        Parameters:
+        - buffer: Buffer of the agent class, as stored in _agent_buffers
+        - values: Dictionary of column names and the new values for each (list or array)
+        - num_rows: Number of new rows
+        - codes: Optional dictionary of column names and new values that are already
+          codes of the column's categories
+        '''
+        start = buffer["rows"]
+        end = start + num_rows
+        columns = buffer["columns"]
+        all_categories = buffer["categories"]
+        pending = buffer["pending"]
+
+        for name, column_values in [*values.items(), *(codes or {}).items()]:
+            categories = all_categories.get(name)
+            if codes and name in codes:
+                new_values = column_values
+            else:
+                new_values = np.asarray(column_values)
+                # Whether the column's type is still to be chosen from its values
+                undecided = categories is None and (name not in columns or name in pending)
+
+                if undecided and new_values.dtype == object and all(value is None for value in column_values):
+                    # Only None so far, keep the column as object until its type is known
+                    pending.add(name)
+                else:
+                    if new_values.dtype == object:
+                        try:
+                            # Numbers mixed with None, e.g. a ratio that is not defined yet
+                            new_values = np.asarray(column_values, dtype=np.float64)
+                        except (TypeError, ValueError):
+                            pass
+
+                    if undecided and new_values.dtype.kind not in "iufb":
+                        categories = all_categories[name] = {}
+                        if name in columns:
+                            # Earlier rows are all None, give them the first code
+                            categories[None] = 0
+                            columns[name] = np.zeros(len(columns[name]), dtype=np.int32)
+                    elif undecided and name in columns:
+                        # Earlier rows are all None, which is NaN in a numeric column
+                        columns[name] = np.full(len(columns[name]), np.nan)
+                    pending.discard(name)
+
+                if categories is not None:
+                    # Code every value by its order of first appearance
+                    new_values = np.array(
+                        [categories.setdefault(value, len(categories)) for value in column_values],
+                        dtype=np.int32,
+                    )
+
+            column = columns.get(name)
+            if column is None:
+                # Choose the column's dtype from its first values
+                kind = new_values.dtype.kind
+                if categories is not None:
+                    dtype = np.int32
+                elif kind == "b":
+                    dtype = bool
+                elif kind in "iuf":
+                    dtype = EconomyDataCollector._fitting_dtype(np.dtype(np.int32), new_values)
+                else:
+                    dtype = object
+                column = columns[name] = np.empty(max(2 * num_rows, 1), dtype=dtype)
+            elif end > len(column):
+                column = columns[name] = np.resize(column, max(2 * len(column), end))
+
+            if categories is None:
+                dtype = EconomyDataCollector._fitting_dtype(column.dtype, new_values)
+                if dtype != column.dtype:
+                    # Widen the column to hold the new values, e.g. floats in an integer column
+                    column = columns[name] = column.astype(dtype)
+
+            column[start:end] = new_values
+
+        buffer["rows"] = end
+
+    @staticmethod
+    def _fitting_dtype(column_dtype, new_values):
+        '''
+        Return the dtype a column needs to also hold the given values.
+
+        Parameters:
+        - column_dtype: Current dtype of the column
+        - new_values: NumPy array of the values to store
+
+        Integer columns start as int32. Columns of string codes are int32 too, but
+        never reach here since their codes always fit.
+
+        Returns:
+        - column_dtype if the values fit it, otherwise the narrowest wider dtype that
+          holds them: int64 for integers beyond the int32 range, float64 for floats
+          in an integer column (or integers beyond int64) and object for anything else
+        '''
+        kind = new_values.dtype.kind
+        if column_dtype.kind == "b":
+            return column_dtype if kind == "b" else np.dtype(object)
+
+        if column_dtype.kind == "i":
+            if kind == "f":
+                return np.dtype(np.float64)
+            if kind not in "iub":
+                return np.dtype(object)
+            limits = np.iinfo(column_dtype)
+            if not len(new_values) or (limits.min <= new_values.min() and new_values.max() <= limits.max):
+                return column_dtype
+            return np.dtype(np.int64) if column_dtype != np.int64 else np.dtype(np.float64)
+
+        if column_dtype.kind == "f":
+            return column_dtype if kind in "iufb" else np.dtype(object)
+
+        return column_dtype
+
+    @staticmethod
+    def _column_values(buffer, name, as_category=False):
+        '''
+        Return the collected values of a column, decoding coded columns.
+
+        Parameters:
+        - buffer: Buffer of the agent class, as stored in _agent_buffers
+        - name: Column name
+        - as_category: Whether to return a coded column as a pandas Categorical,
+          with None as a missing value, instead of an object array of its values
+
+        Returns:
+        - Array (or Categorical) with one value per collected row
+        '''
+        column = buffer["columns"][name][:buffer["rows"]]
+        categories = buffer["categories"].get(name)
+        if categories is None:
+            return column
+
+        labels = np.empty(len(categories), dtype=object)
+        labels[:] = list(categories)
+        if not as_category:
+            return labels[column]
+
+        # Categorical codes skip None, which becomes code -1 (missing)
+        present = np.array([label is not None for label in labels], dtype=bool)
+        category_codes = np.full(len(labels), -1, dtype=np.int32)
+        category_codes[present] = np.arange(present.sum())
+        return pd.Categorical.from_codes(category_codes[column], categories=labels[present])
+
+    def clear(self):
+        '''
+        Release all collected model and agent data while keeping the reporters.
+
+        Call this once the collected data has been saved, e.g. between the runs of a
+        batch, so the collector no longer holds every collected value in memory.
+        Collection can continue afterwards and starts again from empty tables.
+        '''
+        for values in self.model_vars.values():
+            values.clear()
+
+        self._agent_buffers = {
+            agent_class: self._new_agent_buffer(agent_class) for agent_class in self.agent_class_reporters
+        }
+
+    def get_model_vars_dataframe(self):
+        '''
+        Create a pandas DataFrame from the model variables.
+
+        Returns:
+        - DataFrame with one column per model variable, indexed by collection
+        '''
+        if not self.model_reporters and not self._model_group_reporters:
+            raise UserWarning(
+                "No model reporters have been defined in the DataCollector, returning empty DataFrame."
+            )
+
+        return pd.DataFrame(self.model_vars)
+
+    def get_agent_vars_dataframe(self):
+        '''
+        Create a pandas DataFrame from the agent variables of all agent classes.
+
+        Returns:
+        - DataFrame indexed by Step and AgentID with one column per reporter.
+          Columns that do not apply to an agent's class are NaN.
+        '''
+        if not self.agent_class_reporters:
+            raise UserWarning(
+                "No agent reporters have been defined in the DataCollector, returning empty DataFrame."
+            )
+
+        buffers = [buffer for buffer in self._agent_buffers.values() if buffer["rows"]]
+        if not buffers:
+            return pd.DataFrame(columns=self.agent_columns, index=pd.MultiIndex.from_tuples([], names=["Step", "AgentID"]))
+
+        # Same row order as mesa.DataCollector: by step, then by agent creation order
+        steps = np.concatenate([self._column_values(buffer, "Step") for buffer in buffers]).astype(np.int64)
+        agent_ids = np.concatenate([self._column_values(buffer, "AgentID") for buffer in buffers]).astype(np.int64)
+        order = np.lexsort((agent_ids, steps))
+
+        # Build each column once from the per-class buffers, already in row order,
+        # rather than concatenating per-class frames and then reindexing and sorting them
+        data = {}
+        for name in self.agent_columns:
+            parts = [
+                self._column_values(buffer, name) if name in buffer["columns"]
+                else np.full(buffer["rows"], np.nan)
+                for buffer in buffers
+            ]
+            if len(parts) > 1 and any(part.dtype.kind in "bO" for part in parts) \
+                    and any(part.dtype != parts[0].dtype for part in parts):
+                # Like pandas, bool and object columns mixed with missing values become object
+                parts = [part.astype(object) for part in parts]
+            data[name] = np.concatenate(parts)[order]
+
+        index = pd.MultiIndex.from_arrays([steps[order], agent_ids[order]], names=["Step", "AgentID"])
+        return pd.DataFrame(data, index=index, columns=self.agent_columns)
+
+    def get_agent_class_dataframe(self, agent_class):
+        '''
+        Create a pandas DataFrame from the agent variables of one agent class.
+
+        Unlike the combined DataFrame, the table only has the columns of this class,
+        so every column keeps its own dtype: int32 for integers (int64 if a value
+        needed it), float64 for other numbers and for integers mixed with missing
+        values, bool for flags and category (built from the stored int32 codes) for
+        strings such as brackets, firm areas or skill types. Step and AgentID are
+        int64 index levels.
+
+        Parameters:
+        - agent_class: Agent class whose reporters to return, e.g. FirmAgent
+
+        Returns:
+        - DataFrame indexed by Step and AgentID with one column per reporter of the class
+        '''
+        if agent_class not in self.agent_class_reporters:
+            raise ValueError(f"No agent reporters have been defined for {agent_class.__name__}.")
+
+        buffer = self._agent_buffers[agent_class]
+        names = ["Step", "AgentID", *self.agent_class_reporters[agent_class]]
+        columns = buffer["columns"]
+
+        df = pd.DataFrame({
+            name: self._column_values(buffer, name, as_category=True) if name in columns else np.empty(0)
+            for name in names
+        })
+        df = df.astype({"Step": np.int64, "AgentID": np.int64})
+        for name in df.columns[df.dtypes == object]:
+            df[name] = df[name].astype("category")
+
+        return df.set_index(["Step", "AgentID"]).sort_index()
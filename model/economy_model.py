@@ -1,12 +1,116 @@
+import logging
+import operator
 import mesa
 import numpy as np
-import pandas as pd
-import random
 from agents import GovernmentAgent
 from agents import FirmAgent
 from agents import HouseholdAgent
 from agents import IntermediaryFirmAgent
 from agents import PersonAgent
+from agents.person_agent import SKILL_TYPES
+from .data_collector import EconomyDataCollector
+
+logger = logging.getLogger(__name__)
+
+
+# Firm tiers created at model start. Integer ranges are inclusive; each firm of a
+# tier draws its capacity, unit cost, entry wage and initial hiring target from them
+FIRM_TIERS = (
+    # --- NECESSITY FIRMS ---
+    # Physical firms (manufacturing, construction, farming)
+    {"firm_type": "necessity", "firm_area": "physical", "product": "Physical", "n": 25, "markup": 2,
+     "production_capacity": (12000, 18000), "production_cost": (1.8, 3.5),
+     "entry_wage": (60000, 75000), "initial_employee_target": (30, 120)},
+    # Service firms (retail, food service, basic services)
+    {"firm_type": "necessity", "firm_area": "service", "product": "Service", "n": 25, "markup": 3,
+     "production_capacity": (9000, 21000), "production_cost": (1.5, 3.5),
+     "entry_wage": (54000, 66000), "initial_employee_target": (15, 50)},
+    # --- LUXURY FIRMS ---
+    # Technical firms (tech companies, engineering)
+    {"firm_type": "luxury", "firm_area": "technical", "product": "Technical", "n": 10, "markup": 7,
+     "production_capacity": (900, 2100), "production_cost": (50.0, 150.0),
+     "entry_wage": (144000, 180000), "initial_employee_target": (10, 80)},
+    # Creative firms (design, arts, media)
+    {"firm_type": "luxury", "firm_area": "creative", "product": "Creative", "n": 5, "markup": 6,
+     "production_capacity": (600, 1500), "production_cost": (40.0, 80.0),
+     "entry_wage": (108000, 144000), "initial_employee_target": (5, 30)},
+    # Social firms (management consulting, education)
+    {"firm_type": "luxury", "firm_area": "social", "product": "Social", "n": 5, "markup": 5,
+     "production_capacity": (450, 1200), "production_cost": (60.0, 100.0),
+     "entry_wage": (120000, 156000), "initial_employee_target": (8, 40)},
+    # Analytical firms (finance, data analysis)
+    {"firm_type": "luxury", "firm_area": "analytical", "product": "Analytical", "n": 5, "markup": 6,
+     "production_capacity": (300, 1000), "production_cost": (80.0, 150.0),
+     "entry_wage": (132000, 172000), "initial_employee_target": (5, 25)},
+)
+
+# Government attributes reported as model data each step, in model data column order
+GOVERNMENT_INDICATORS = operator.attrgetter(
+    "reserves", "step_public_spending", "step_corporate_tax_revenue", "unemployment_rate",
+    "GDP", "step_tax_revenue", "inflation_rate", "gini_coefficient",
+)
+
+# Model data: government indicators, read together in one call and stored one column each
+MODEL_REPORTERS = {
+    ("Reserves", "Step Public Spending", "Step Corporate Tax Revenue", "Unemployment Rate",
+     "GDP", "Tax Revenue", "Inflation Rate", "Gini Coefficient"):
+        lambda m: GOVERNMENT_INDICATORS(m.government_agent),
+}
+
+# Agent data reported by each agent class: column name and attribute name or function
+AGENT_REPORTERS = {
+    FirmAgent: {
+        "FirmType": "firm_type",
+        "FirmArea": "firm_area",
+        "Profit": "profit",
+        "Inventory": "inventory",
+        "ProductPrice": "product_price",
+        "RevenuePerEmployee": "revenue_per_employee",
+        "ProductionLevel": "production_level",
+        "NumEmployees": "num_employees",
+        "DemandReceived": "demand_for_tracking",
+        "InventoryDemandRatio": "inventory_demand_ratio",
+        "SellThroughRate": "sell_through_rate",
+        "ProductionCapacity": "production_capacity",
+        "Revenue": "revenue",
+        "Costs": "costs",
+        "Markup": "markup",
+        "ProducedUnits": "produced_units",
+        "UnmetDemand": "unmet_demand",
+        "Capital": "capital",
+    },
+    IntermediaryFirmAgent: {
+        "NumEmployees": "num_employees",
+        "Revenue": "revenue",
+        "Capital": "capital",
+    },
+    HouseholdAgent: {
+        "IncomeBracket": "income_bracket",
+        "WealthBracket": "wealth_bracket",
+        "NumPeople": "num_people",
+        "HouseholdStepIncome": "household_step_income",
+        "HouseholdStepIncomePostTax": "household_step_income_posttax",
+        "HouseholdStepExpense": "household_step_expense",
+        "HouseholdStepSavings": "household_step_savings",
+        "TotalHouseholdSavings": "total_household_savings",
+        "HealthLevel": "health_level",
+        "Welfare": "welfare",
+        "DebtLevel": "debt_level",
+        "IncomeTaxRate": "income_tax_rate",
+        "NumWorkingPeople": "num_working_people",
+        "NumNotSeekingJob": "num_not_seeking_job",
+        "NumSeekingJob": "num_seeking_job",
+    },
+    PersonAgent: {
+        "SkillLevel": "skill_level",
+        "SkillType": "skill_type",
+        "JobLevel": "job_level",
+        "IsEmployed": "is_employed",
+        "Wage": "wage",
+        "JobSeeking": "job_seeking",
+        "Labor": "labor",
+    },
+}
 
 
 class EconomicSimulationModel(mesa.Model):
@@ -18,10 +122,15 @@ class EconomicSimulationModel(mesa.Model):
     their initial states, and coordinates their interactions throughout the simulation.
     The model also collects and tracks economic data using Mesa's DataCollector.
     '''
-    def __init__(self):
+    def __init__(self, seed=None, collect_agents_every=1):
         '''
         Initialize the economic simulation model with all agent types and relationships.
         
+        Parameters:
+        - seed: Optional seed for the model's random number generators
+        - collect_agents_every: Collect agent data every this many steps; model
+          data is collected every step
+        
         This method:
         1. Sets up data collection for economic indicators
         2. Creates government, firm, household, and person agents
@@ -29,184 +138,83 @@ class EconomicSimulationModel(mesa.Model):
         4. Assigns persons to households
         5. Handles cleanup of unassigned agents
         '''
-        super().__init__()
+        super().__init__(seed=seed)
         
         # Initialize step counter
         self.current_step = 0
-        self.available_persons = []
+        self.collect_agents_every = collect_agents_every
+        # Dicts used as insertion-ordered sets so persons can be removed in O(1)
+        # while iteration order stays reproducible for a given seed
+        self.available_persons = {}
         self.num_persons = 30000
 
         # Setup data collection for model analysis and visualization
-        self.datacollector = mesa.DataCollector(
-            model_reporters={
-                "Reserves": lambda m: m.government_agent.reserves,
-                "Step Public Spending": lambda m: m.government_agent.step_public_spending,
-                "Step Corporate Tax Revenue": lambda m: m.government_agent.step_corporate_tax_revenue,
-                "Unemployment Rate": lambda m: m.government_agent.unemployment_rate,
-                "GDP": lambda m: m.government_agent.GDP,
-                "Tax Revenue": lambda m: m.government_agent.step_tax_revenue,
-                "Inflation Rate": lambda m: m.government_agent.inflation_rate,
-                "Gini Coefficient": lambda m: m.government_agent.gini_coefficient,
-            },
-            agent_reporters= {
-                 # Firm agent fields
-                "FirmType": lambda a: getattr(a, "firm_type", None),
-                "FirmArea": lambda a: getattr(a, "firm_area", None),
-                "Profit": lambda a: getattr(a, "profit", None),
-                "Inventory": lambda a: getattr(a, "inventory", None),
-                "ProductPrice": lambda a: getattr(a, "product_price", None),
-                "RevenuePerEmployee": lambda a: getattr(a, "revenue_per_employee", None),
-                "ProductionLevel": lambda a: getattr(a, "production_level", None),
-                "NumEmployees": lambda a: getattr(a, "num_employees", None),
-                "DemandReceived": lambda a: getattr(a, "demand_for_tracking", None),
-                "InventoryDemandRatio": lambda a: getattr(a, "inventory_demand_ratio", None),
-                "SellThroughRate": lambda a: getattr(a, "sell_through_rate", None),
-                "ProductionCapacity": lambda a: getattr(a, "production_capacity", None),
-                "Revenue": lambda a: getattr(a, "revenue", None),
-                "Costs": lambda a: getattr(a, "costs", None),
-                "Markup": lambda a: getattr(a, "markup", None),
-                "ProducedUnits": lambda a: getattr(a, "produced_units", None),
-                "UnmetDemand": lambda a: getattr(a, "unmet_demand", None),
-                "Capital": lambda a: getattr(a, "capital", None),
-                
-
-                # Household agent fields
-                "IncomeBracket": lambda a: getattr(a, "income_bracket", None),
-                "WealthBracket": lambda a: getattr(a, "wealth_bracket", None),
-                "NumPeople": lambda a: getattr(a, "num_people", None),
-                "HouseholdStepIncome": lambda a: getattr(a, "household_step_income", None),
-                "HouseholdStepIncomePostTax": lambda a: getattr(a, "household_step_income_posttax", None),
-                "HouseholdStepExpense": lambda a: getattr(a, "household_step_expense", None),
-                "HouseholdStepSavings": lambda a: getattr(a, "household_step_savings", None),
-                "TotalHouseholdSavings": lambda a: getattr(a, "total_household_savings", None),
-                "HealthLevel": lambda a: getattr(a, "health_level", None),
-                "Welfare": lambda a: getattr(a, "welfare", None),
-                "DebtLevel": lambda a: getattr(a, "debt_level", None),
-                "IncomeTaxRate": lambda a: getattr(a, "income_tax_rate", None),
-                "NumWorkingPeople": lambda a: getattr(a, "num_working_people", None),
-                "NumNotSeekingJob": lambda a: getattr(a, "num_not_seeking_job", None),
-                "NumSeekingJob": lambda a: getattr(a, "num_seeking_job", None),
-                
-                # Person agent fields
-                "SkillLevel": lambda a: getattr(a, "skill_level", None),
-                "SkillType": lambda a: getattr(a, "skill_type", None),
-                "JobLevel": lambda a: getattr(a, "job_level", None),
-                "IsEmployed": lambda a: 1 if getattr(a, "employer", None) is not None else 0,
-                "Wage": lambda a: getattr(a, "wage", None),
-                "JobSeeking": lambda a: getattr(a, "job_seeking", None),
-                "Labor": lambda a: getattr(a, "labor", None),
-            }
+        self.datacollector = EconomyDataCollector(
+            model_reporters=MODEL_REPORTERS,
+            agent_reporters=AGENT_REPORTERS,
         )
         
         # Create the government agent first
         self.government_agent = GovernmentAgent.create_agents(model=self, n=1)[0]
         
-        # Create population of persons
-        for i in range(self.num_persons):
-            person = PersonAgent(model=self)
-            self.available_persons.append(person)
+        # Person state arrays, one row per person, so all persons can be
+        # stepped together with array operations
+        self.person_skill_level = np.zeros(self.num_persons)
+        self.person_skill_type_id = np.zeros(self.num_persons, dtype=np.int8)
+        self.person_job_seeking = np.zeros(self.num_persons, dtype=bool)
+        self.person_studying = np.zeros(self.num_persons, dtype=bool)
+        self.person_employed = np.zeros(self.num_persons, dtype=bool)
+        self.person_is_employed = self.person_employed.view(np.int8) # person_employed as 0/1, for reporting
+        self.person_wage = np.zeros(self.num_persons)
+        self.person_in_model = np.ones(self.num_persons, dtype=bool) # Cleared for persons removed at setup
 
-        # Create firms with different areas and suitable parameters
-        
-        # --- NECESSITY FIRMS ---
-        
-        # Physical firms (manufacturing, construction, farming) - 25 firms
-        n_physical = 25
-        FirmAgent.create_agents(
-            model=self,
-            n=n_physical,
-            firm_type="necessity",
-            firm_area="physical",
-            product=[f"Physical_{i}" for i in range(n_physical)],
-            production_capacity=[random.randint(12000, 18000) for _ in range(n_physical)],
-            markup=2,
-            production_cost=[random.uniform(1.8, 3.5) for _ in range(n_physical)],
-            entry_wage=[random.randint(60000, 75000) for _ in range(n_physical)],
-            initial_employee_target=[random.randint(30, 120) for _ in range(n_physical)],
-            #production_level=[random.uniform(0.7, 1) for _ in range(n_physical)]
-        )
-        
-        # Service firms (retail, food service, basic services) - 25 firms
-        n_service = 25
-        FirmAgent.create_agents(
-            model=self,
-            n=n_service,
-            firm_type="necessity",
-            firm_area="service",
-            product=[f"Service_{i}" for i in range(n_service)],
-            production_capacity=[random.randint(9000, 21000) for _ in range(n_service)],
-            markup=3,
-            production_cost=[random.uniform(1.5, 3.5) for _ in range(n_service)],
-            entry_wage=[random.randint(54000, 66000) for _ in range(n_service)],
-            initial_employee_target=[random.randint(15, 50) for _ in range(n_service)],
-            #production_level=[random.uniform(0.6, 0.9) for _ in range(n_service)]
-        )
-        
-        # --- LUXURY FIRMS ---
-        
-        # Technical firms (tech companies, engineering) - 10 firms
-        n_technical = 10
-        FirmAgent.create_agents(
-            model=self,
-            n=n_technical,
-            firm_type="luxury",
-            firm_area="technical",
-            product=[f"Technical_{i}" for i in range(n_technical)],
-            production_capacity=[random.randint(900, 2100) for _ in range(n_technical)],
-            markup=7,
-            production_cost=[random.uniform(50.0, 150.0) for _ in range(n_technical)],
-            entry_wage=[random.randint(144000, 180000) for _ in range(n_technical)],
-            initial_employee_target=[random.randint(10, 80) for _ in range(n_technical)],
-            #production_level=[random.uniform(0.5, 0.9) for _ in range(n_technical)]
-        )
-        
-        # Creative firms (design, arts, media) - 5 firms
-        n_creative = 5
-        FirmAgent.create_agents(
-            model=self,
-            n=n_creative,
-            firm_type="luxury",
-            firm_area="creative",
-            product=[f"Creative_{i}" for i in range(n_creative)],
-            production_capacity=[random.randint(600, 1500) for _ in range(n_creative)],
-            markup=6,
-            production_cost=[random.uniform(40.0, 80.0) for _ in range(n_creative)],
-            entry_wage=[random.randint(108000, 144000) for _ in range(n_creative)],
-            initial_employee_target=[random.randint(5, 30) for _ in range(n_creative)],
-            #production_level=[random.uniform(0.4, 0.8) for _ in range(n_creative)]
-        )
-        
-        # Social firms (management consulting, education) - 5 firms
-        n_social = 5
-        FirmAgent.create_agents(
-            model=self,
-            n=n_social,
-            firm_type="luxury",
-            firm_area="social",
-            product=[f"Social_{i}" for i in range(n_social)],
-            production_capacity=[random.randint(450, 1200) for _ in range(n_social)],
-            markup=5,
-            production_cost=[random.uniform(60.0, 100.0) for _ in range(n_social)],
-            entry_wage=[random.randint(120000, 156000) for _ in range(n_social)],
-            initial_employee_target=[random.randint(8, 40) for _ in range(n_social)],
-            #production_level=[random.uniform(0.5, 0.9) for _ in range(n_social)]
-        )
-        
-        # Analytical firms (finance, data analysis) - 5 firms
-        n_analytical = 5
-        FirmAgent.create_agents(
-            model=self,
-            n=n_analytical,
-            firm_type="luxury",
-            firm_area="analytical",
-            product=[f"Analytical_{i}" for i in range(n_analytical)],
-            production_capacity=[random.randint(300, 1000) for _ in range(n_analytical)],
-            markup=6,
-            production_cost=[random.uniform(80.0, 150.0) for _ in range(n_analytical)],
-            entry_wage=[random.randint(132000, 172000) for _ in range(n_analytical)],
-            initial_employee_target=[random.randint(5, 25) for _ in range(n_analytical)],
-            #production_level=[random.uniform(0.6, 0.9) for _ in range(n_analytical)]
-        )
+        # Draw every person's skill type, skill level and labor in bulk. Skill levels
+        # follow a normal distribution with mean 50 and std 15, clipped to 1-100
+        self.person_skill_type_id[:] = self.rng.integers(0, len(SKILL_TYPES), self.num_persons)
+        self.rng.standard_normal(out=self.person_skill_level)
+        self.person_skill_level *= 15
+        self.person_skill_level += 50
+        np.clip(self.person_skill_level, 1, 100, out=self.person_skill_level)
+        self.person_labor = self.person_skill_level / self.rng.uniform(3, 5, self.num_persons)
+
+        # Create population of persons, one per row of the person arrays, so the
+        # persons selected with array operations can be looked up by row
+        self.persons = [PersonAgent(model=self, idx=i) for i in range(self.num_persons)]
+        self.available_persons = dict.fromkeys(self.persons)
+
+        # Create firms with different areas and suitable parameters, all in one batch.
+        # Each parameter is gathered as one column over all firms
+        firm_columns = {"firm_type": [], "firm_area": [], "product": [], "markup": []}
+        for tier in FIRM_TIERS:
+            n = tier["n"]
+            firm_columns["firm_type"] += [tier["firm_type"]] * n
+            firm_columns["firm_area"] += [tier["firm_area"]] * n
+            firm_columns["product"] += [f"{tier['product']}_{i}" for i in range(n)]
+            firm_columns["markup"] += [tier["markup"]] * n
+
+        # Draw each random parameter for all firms in one call, with each firm's
+        # bounds taken from its tier
+        tier_sizes = [tier["n"] for tier in FIRM_TIERS]
+        def firm_bounds(parameter):
+            low, high = np.array([tier[parameter] for tier in FIRM_TIERS]).T
+            return np.repeat(low, tier_sizes), np.repeat(high, tier_sizes)
+
+        for parameter in ("production_capacity", "entry_wage", "initial_employee_target"):
+            low, high = firm_bounds(parameter)
+            firm_columns[parameter] = self.rng.integers(low, high + 1).tolist()
+        firm_columns["production_cost"] = self.rng.uniform(*firm_bounds("production_cost")).tolist()
+
+        FirmAgent.create_agents(model=self, n=len(firm_columns["product"]), **firm_columns)
+
+        # All firms share the same minimum skill requirements, so keep one copy on
+        # the model for persons to look up instead of scanning agents every step
+        self.min_skill_levels_config = FirmAgent.min_skill_levels_config
+
+        # Entry-level skill requirement per skill type id (10 if not configured)
+        self.min_entry_table = np.array([
+            self.min_skill_levels_config[skill_type]["entry"] if skill_type in self.min_skill_levels_config else 10
+            for skill_type in SKILL_TYPES
+        ])
 
         # --- INTERMEDIARY FIRM ---
         # Create the intermediary firm that supplies raw materials to other firms
@@ -222,8 +230,7 @@ class EconomicSimulationModel(mesa.Model):
         HouseholdAgent.create_agents(
             model=self,
             n=n_households,
-            num_people=[random.randint(1, 5) for _ in range(n_households)],
-            income_tax_rate=0.15  
+            num_people=self.rng.integers(1, 6, size=n_households).tolist(),
         )
 
         # Assign persons to households
@@ -231,36 +238,49 @@ class EconomicSimulationModel(mesa.Model):
 
         # Cleanup Unassigned PersonAgents
         persons_to_remove = list(self.available_persons) 
-        removed_count = 0
-        actually_removed_from_schedule_count = 0
-
-        for person in persons_to_remove:
-            # Any person who is not in a household by this stage should be removed
-            if person.household is None:
-                try:
-                    self.agents.remove(person) # Remove from scheduler
-                    actually_removed_from_schedule_count += 1
-                except ValueError:
-                    pass
-
-                if hasattr(self, 'agents') and person in self.agents:
-                    try:
-                        self.agents.remove(person) 
-                    except ValueError:
-                        pass 
-
-                # Remove from our temporary tracking list `available_persons`
-                if person in self.available_persons:
-                     self.available_persons.remove(person)
-                removed_count +=1 
-            # else:
-                # print(f"[DEBUG] EconomicSimulationModel: Person {person.unique_id} is in a household. Not removing from simulation.")
+
+        # Any person who is not in a household by this stage should be removed
+        unassigned_persons = [person for person in persons_to_remove if person.household is None]
+
+        for person in unassigned_persons:
+            # Deregister from the model, which removes the person from self.agents and
+            # from agents_by_type in one go
+            person.remove()
+
+            # Remove from our temporary tracking list `available_persons`
+            self.available_persons.pop(person, None)
+
+        removed_count = len(unassigned_persons)
+        actually_removed_from_schedule_count = len(unassigned_persons)
         
-        print(f"[DEBUG] EconomicSimulationModel: Finished cleanup. Iterated {len(persons_to_remove)} from available_persons initially.")
-        print(f"[DEBUG] EconomicSimulationModel: Removed {removed_count} persons from available_persons list based on household status.")
-        print(f"[DEBUG] EconomicSimulationModel: Attempted to remove {actually_removed_from_schedule_count} persons from schedule.")
-        print(f"[DEBUG] EconomicSimulationModel: {len(self.available_persons)} persons remaining in available_persons list (should be 0).")
-        print(f"[DEBUG] EconomicSimulationModel: Total agents in scheduler after cleanup: {len(self.agents)}.")
+        logger.debug("EconomicSimulationModel: Finished cleanup. Iterated %s from available_persons initially.", len(persons_to_remove))
+        logger.debug("EconomicSimulationModel: Removed %s persons from available_persons list based on household status.", removed_count)
+        logger.debug("EconomicSimulationModel: Attempted to remove %s persons from schedule.", actually_removed_from_schedule_count)
+        logger.debug("EconomicSimulationModel: %s persons remaining in available_persons list (should be 0).", len(self.available_persons))
+        logger.debug("EconomicSimulationModel: Total agents in scheduler after cleanup: %s.", len(self.agents))
+
+        # Agents are not added or removed after setup, so take the partitions by type
+        # once from Mesa's type buckets (which keep creation order)
+        self.person_agents = tuple(self.agents_by_type[PersonAgent])
+        self.household_agents = tuple(self.agents_by_type[HouseholdAgent])
+        self.firm_agents = tuple(self.agents_by_type[FirmAgent])
+        self.intermediary_firm_agents = tuple(self.agents_by_type[IntermediaryFirmAgent])
+
+        # Rows of the persons that remain in the simulation and are stepped each step
+        self.person_rows = np.array([a.idx for a in self.person_agents])
+
+        self.person_in_model[:] = False
+        self.person_in_model[self.person_rows] = True
+
+        # Bound step methods of each phase, so the step loops do not look up .step per agent
+        self.household_steps = tuple(agent.step for agent in self.household_agents)
+        self.firm_steps = tuple(agent.step for agent in self.firm_agents)
+        self.intermediary_firm_steps = tuple(agent.step for agent in self.intermediary_firm_agents)
+
+        # Firms by area, the only agents households can buy from in each category
+        self.firms_by_area = {}
+        for firm in self.firm_agents:
+            self.firms_by_area.setdefault(firm.firm_area, []).append(firm)
 
 
     def _assign_persons_to_households(self):
@@ -275,67 +295,69 @@ class EconomicSimulationModel(mesa.Model):
         After assignment, each household's employment statistics are updated.
         '''
         if not hasattr(self, 'available_persons'):
-            print("[ERROR] _assign_persons_to_households: self.available_persons not found.")
+            logger.error("_assign_persons_to_households: self.available_persons not found.")
             return
 
         # Separate employed and unemployed persons for prioritized placement
         employed_to_place = [p for p in self.available_persons if p.employer is not None and p.household is None]
         unemployed_to_place = [p for p in self.available_persons if p.employer is None and p.household is None]
 
-        random.shuffle(employed_to_place)
-        random.shuffle(unemployed_to_place)
-
-        all_households = [h for h in self.agents if isinstance(h, HouseholdAgent)]
-        random.shuffle(all_households)
-
-        print(f"[INFO] Assigning persons: Initial - {len(employed_to_place)} employed, {len(unemployed_to_place)} unemployed. {len(all_households)} households.")
-
-        # Distribute employed persons first, one per household per pass
-        placed_in_a_pass = True # Flag to continue passes if someone was placed
-        while employed_to_place and placed_in_a_pass:
-            placed_in_this_pass = False
-            # Iterate over a copy of all_households in case its order needs to be stable for a pass, or shuffled each pass
-            # For fairness, shuffling each pass might be better if some households fill up.
-            random.shuffle(all_households) 
-            for hh in all_households:
-                if not employed_to_place: # All employed persons have been placed
-                    break
-                if hh.current_population < hh.num_people:
-                    person = employed_to_place.pop(0)
-                    hh.members.append(person)
-                    person.household = hh
-                    hh.current_population += 1
-                    if person in self.available_persons:
-                        self.available_persons.remove(person)
-                    placed_in_this_pass = True
-                    # print(f"[DEBUG] Assigned Employed {person.unique_id} to HH {hh.unique_id} (Pop: {hh.current_population}/{hh.num_people})")
-            
-            placed_in_a_pass = placed_in_this_pass # Continue if at least one person was placed in the full pass
+        self.random.shuffle(employed_to_place)
+        self.random.shuffle(unemployed_to_place)
+
+        all_households = list(self.agents_by_type[HouseholdAgent])
+        self.random.shuffle(all_households)
+
+        logger.info("Assigning persons: Initial - %s employed, %s unemployed. %s households.", len(employed_to_place), len(unemployed_to_place), len(all_households))
+
+        # Distribute employed persons first, one per household per round: round r visits,
+        # in random order, every household with room for more than r members
+        employed_slots = []
+        round_number = 0
+        while len(employed_slots) < len(employed_to_place):
+            households_with_room = [
+                hh for hh in all_households if hh.num_people - hh.current_population > round_number
+            ]
+            if not households_with_room:
+                break
+            self.random.shuffle(households_with_room)
+            employed_slots.extend(households_with_room)
+            round_number += 1
+
+        for person, hh in zip(employed_to_place, employed_slots):
+            hh.members.append(person)
+            person.household = hh
+            hh.current_population += 1
+            self.available_persons.pop(person, None)
+            # print(f"[DEBUG] Assigned Employed {person.unique_id} to HH {hh.unique_id} (Pop: {hh.current_population}/{hh.num_people})")
+
+        # Employed persons left over when all households are full
+        employed_to_place = employed_to_place[len(employed_slots):]
 
         if employed_to_place: # Should only happen if no households have space left
-            print(f"[DEBUG] WARNING!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!11 EconomicSimulationModel: {len(employed_to_place)} employed persons could not be placed in any household due to lack of capacity.")
+            logger.warning("EconomicSimulationModel: %s employed persons could not be placed in any household due to lack of capacity.", len(employed_to_place))
             #for person in employed_to_place:
                  #print(f"[ERROR] EconomicSimulationModel: Could not place employed Person {person.unique_id} (Employer: {person.employer.unique_id if person.employer else 'None'}) in any household due to lack of overall capacity. This person may be removed if unhoused.")
                   # These persons remain in employed_to_place (and thus were in available_persons and not removed)
                  # and their person.household is None. The cleanup step will handle them.
 
-        # Fill remaining household space with unemployed persons
-        random.shuffle(all_households)
-        for hh in all_households:
-            while hh.current_population < hh.num_people and unemployed_to_place:
-                person = unemployed_to_place.pop(0)
-                hh.members.append(person)
-                person.household = hh
-                hh.current_population += 1
-                if person in self.available_persons:
-                    self.available_persons.remove(person)
+        # Fill remaining household space with unemployed persons, one household at a time
+        self.random.shuffle(all_households)
+        unemployed_slots = [
+            hh for hh in all_households for _ in range(hh.num_people - hh.current_population)
+        ]
+        for person, hh in zip(unemployed_to_place, unemployed_slots):
+            hh.members.append(person)
+            person.household = hh
+            hh.current_population += 1
+            self.available_persons.pop(person, None)
 
         # Update employment counts for all households
         for hh_agent in all_households:
             if hasattr(hh_agent, '_update_employment_counts'):
                 hh_agent._update_employment_counts()
         
-        print(f"[INFO] Person assignment complete. {len(self.available_persons)} persons remain unassigned (these will be cleaned up if household is None).")
+        logger.info("Person assignment complete. %s persons remain unassigned (these will be cleaned up if household is None).", len(self.available_persons))
         
     def step(self):
         '''
@@ -358,38 +380,35 @@ class EconomicSimulationModel(mesa.Model):
         # Step 1: Government Agent acts first
         self.government_agent.step()
         
+        # The phases run one after another on a single thread: households buy from
+        # firms and firms pay the intermediary, so agents of a phase are not independent
+        
         # Step 2: Household Agents act (to generate demand for the current step)
-        household_agents = [agent for agent in self.agents if isinstance(agent, HouseholdAgent)]
-        for agent in household_agents:
-            agent.step()
+        for agent_step in self.household_steps:
+            agent_step()
             
         # Step 3: Firm Agents act (processing demand from Gov & Households from current step)
-        firm_agents = [agent for agent in self.agents if isinstance(agent, FirmAgent)]
-        for agent in firm_agents:
-            agent.step()
+        for agent_step in self.firm_steps:
+            agent_step()
 
         # Step 4: Intermediary Firm Agents act (processing demand from Firms from current step)
-        intermediary_firm_agents = [agent for agent in self.agents if isinstance(agent, IntermediaryFirmAgent)]
-        for agent in intermediary_firm_agents:
-            agent.step()
-
-        # Step 5: Person Agents act (skill updates, job seeking logic)
-        person_agents = [agent for agent in self.agents if isinstance(agent, PersonAgent)]
-        for agent in person_agents:
-            agent.step()
+        for agent_step in self.intermediary_firm_steps:
+            agent_step()
+
+        # Step 5: Person Agents act (skill updates, job seeking logic), all at once
+        PersonAgent.step_persons(self, self.person_rows)
             
         # Step 6: Collect data after all agents have completed their actions for the current step
-        self.datacollector.collect(self)
-        
-        # Find the highest capital value among all firms
-        highest_capital = 0
-        for agent in self.agents:
-            if hasattr(agent, 'capital') and agent.capital is not None and agent.capital > highest_capital:
-                highest_capital = agent.capital
+        self.datacollector.collect(self, agents=self.steps % self.collect_agents_every == 0)
         
         # Step 7: Increment step counter
         self.current_step += 1
         
-        # Print step summary information
+        # Log step summary information; the highest capital is only looked up when it will be logged
         #print(f"[INFO] Step {self.current_step}: Households not meeting necessity goal: {self.unmet_necessity_households_count}")
-        print(f"[DEBUG] Step {self.current_step} completed | Highest Capital: {highest_capital:.2f}")
+        if logger.isEnabledFor(logging.DEBUG):
+            # Find the highest capital value among all firms
+            # (the intermediary firm's capital stays 0, so only production firms can be highest)
+            firm_capital = np.fromiter((firm.capital for firm in self.firm_agents), dtype=np.float64, count=len(self.firm_agents))
+            highest_capital = max(0.0, firm_capital.max()) if firm_capital.size else 0.0
+            logger.debug("Step %s completed | Highest Capital: %.2f", self.current_step, highest_capital)
@@ -1,3 +1,4 @@
+import logging
 import mesa
 from model import EconomicSimulationModel
 from utils import *
@@ -7,6 +8,9 @@ import os
 
 
 def main():
+    # Show the simulation's info messages and warnings; use logging.DEBUG for per-step summaries
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+
     model = EconomicSimulationModel()
     run_name = input("Enter a name for this simulation run: ")
     # Run the model for 60 steps.
@@ -20,6 +24,9 @@ def main():
     agent_data = save_agent_data(model, output_data_folder)
     generate_summary_report(model, output_data_folder)
 
+    # The collected data is saved and held in model_data/agent_data, release the collector's copy
+    model.datacollector.clear()
+
     # Create income bracket distribution chart
     analysis.create_time_series_by_type(
         df=agent_data,
@@ -325,6 +332,8 @@ def main():
         results_folder=output_results_folder
     )
 
+    analysis.close_plots()
+
    
 
     